@@ -1,103 +1,499 @@
 import argparse
-import random
 import time
+import numpy as np
 import pygame
 import sys
-from typing import Set, Tuple, List
+import warnings
+from typing import Dict, Set, Tuple, List, Optional
+
+try:
+    from numba import njit, prange
+except ImportError:  # Numba is optional, the NumPy stencil is used instead
+    njit = None
+
+try:
+    import cupy
+except ImportError:  # CuPy is optional, only needed for --device cuda
+    cupy = None
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Conway's Game of Life")
     parser.add_argument('--width', type=int, default=60, help='Width of the grid')
     parser.add_argument('--height', type=int, default=30, help='Height of the grid')
-    parser.add_argument('--fps', type=int, default=10, help='Frames per second')
+    parser.add_argument('--sim_hz', type=float, default=None, help='Generations per second (default 10)')
+    parser.add_argument('--render_hz', type=int, default=60, help='Frames per second')
+    parser.add_argument('--fps', type=int, default=None, help='Deprecated alias for --sim_hz')
     parser.add_argument('--cell_size', type=int, default=20, help='Size of each cell in pixels')
-    return parser.parse_args()
+    parser.add_argument('--seed', type=int, default=None, help='Seed for random fills')
+    parser.add_argument('--device', choices=['cpu', 'cuda'], default='cpu',
+                        help='Where to compute generations (cuda needs CuPy)')
+    args = parser.parse_args()
+    # --fps used to set both rates, generations per second is what it changed
+    if args.sim_hz is None:
+        args.sim_hz = 10 if args.fps is None else args.fps
+    if args.sim_hz <= 0:
+        parser.error(f"generations per second must be positive, got {args.sim_hz:g}")
+    if args.render_hz <= 0:
+        parser.error(f"frames per second must be positive, got {args.render_hz}")
+    # Checked here so the error comes before the window opens
+    if args.device == 'cuda' and cupy is None:
+        parser.error("--device cuda needs CuPy, which is not installed")
+    return args
+
+# Longest cycle that is replayed instead of recomputed. Every state of a
+# replayed cycle is a copy of the grid, so replay never holds more than this
+# many boards
+_CYCLE_BOARDS = 16
+
+# Columns per block in the changed/active maps used to skip settled regions.
+# Equal to the packed word size, so a block is exactly one word
+_BLOCK_WIDTH = 64
+
+# Cells are packed 64 to a little-endian word along each row: bit i of word k
+# is column 64 * k + i
+_WORD = np.dtype('<u8')
+_SHIFT_ONE = np.uint64(1)
+_SHIFT_TOP = np.uint64(63)
+
+# Zero-bordered pack buffers, one per board shape and reused on every step
+_pack_buffers: Dict[Tuple[int, int], np.ndarray] = {}
+
+def _half_add(a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bitwise half adder, returns (sum, carry)"""
+    return a ^ b, a & b
+
+def _full_add(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bitwise full adder, returns (sum, carry)"""
+    t = a ^ b
+    return t ^ c, (a & b) | (t & c)
+
+def _pack_rows(cells: np.ndarray) -> np.ndarray:
+    """Pack a 0/1 board into row words, with a zero word/row on every side
+    
+    The result is a shared buffer that the next call for the same shape
+    overwrites.
+    """
+    height, width = cells.shape
+    packed = _pack_buffers.get(cells.shape)
+    if packed is None:
+        words_per_row = (width + 63) // 64
+        packed = np.zeros((height + 2, (words_per_row + 2) * 8), dtype=np.uint8)
+        _pack_buffers[cells.shape] = packed
+    packed[1:-1, 8:8 + (width + 7) // 8] = np.packbits(cells, axis=1, bitorder='little')
+    return packed.view(_WORD)
+
+def _step_packed(g: np.ndarray, out: np.ndarray, rows: np.ndarray,
+                 active: np.ndarray, changed: np.ndarray):
+    """Advance the haloed grid g by one generation into out
+    
+    Always recomputes the whole board (rows and active are ignored) and
+    flags in changed the row blocks that differ from g.
+    """
+    width = g.shape[1] - 2
+    bits = _pack_rows(g[1:-1, 1:-1])
+    
+    # Bit i of west/east holds the left/right neighbour of cell i
+    cur = bits[:, 1:-1]
+    west = (cur << _SHIFT_ONE) | (bits[:, :-2] >> _SHIFT_TOP)
+    east = (cur >> _SHIFT_ONE) | (bits[:, 2:] << _SHIFT_TOP)
+    
+    # Per-row sums as 2-bit numbers: all three columns for the rows above and
+    # below, only west + east for the cell's own row
+    row0, row1 = _full_add(west, cur, east)
+    mid0, mid1 = _half_add(west[1:-1], east[1:-1])
+    
+    # Add the three rows: neighbours = ones + 2 * twos + 4 * (fours_a + fours_b)
+    ones, carry = _full_add(row0[:-2], row0[2:], mid0)
+    twos_partial, fours_a = _full_add(row1[:-2], row1[2:], mid1)
+    twos, fours_b = _half_add(twos_partial, carry)
+    
+    # Exactly 3 neighbours, or exactly 2 and already alive
+    alive = twos & ~(fours_a | fours_b) & (ones | cur[1:-1])
+    if width % 64:
+        alive[:, -1] &= np.uint64((1 << width % 64) - 1)
+    out[1:-1, 1:-1] = np.unpackbits(alive.view(np.uint8), axis=1,
+                                    count=width, bitorder='little')
+    # Blocks are words, so changes can be found without unpacking
+    changed[1:-1, 1:-1] = alive != cur[1:-1]
+
+if njit is not None:
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def _step(g: np.ndarray, out: np.ndarray, rows: np.ndarray,
+              active: np.ndarray, changed: np.ndarray):
+        """Advance the haloed grid g by one generation into out
+        
+        active flags the tiles to recompute, each one row by _BLOCK_WIDTH
+        columns, and rows lists the rows that have any active tile. out must
+        already hold the previous generation everywhere else. changed must
+        be clear on entry; recomputed tiles that differ from g are flagged.
+        """
+        width = g.shape[1] - 2
+        blocks = active.shape[1] - 2
+        # Parallelise over the rows with work rather than all rows, so
+        # clustered activity is still spread evenly across threads. Tiles
+        # within a row stay a counted loop, which keeps the inner loop
+        # vectorisable (a flat prange over tiles is ~3x slower when dense)
+        for r in prange(rows.shape[0]):
+            y = rows[r]
+            for b in range(blocks):
+                if not active[y, b + 1]:
+                    continue
+                x0 = b * _BLOCK_WIDTH + 1
+                count = min(_BLOCK_WIDTH, width - b * _BLOCK_WIDTH)
+                # Slide a 3x3 box sum along the row: each step adds one new
+                # column sum, so every cell is loaded three times instead of nine
+                left = g[y - 1, x0 - 1] + g[y, x0 - 1] + g[y + 1, x0 - 1]
+                mid = g[y - 1, x0] + g[y, x0] + g[y + 1, x0]
+                diff = 0
+                for i in range(count):
+                    x = x0 + i
+                    right = g[y - 1, x + 1] + g[y, x + 1] + g[y + 1, x + 1]
+                    cell = g[y, x]
+                    n = left + mid + right - cell
+                    new = (n == 3) | (cell & (n == 2))
+                    out[y, x] = new
+                    diff |= new ^ cell
+                    left, mid = mid, right
+                changed[y, b + 1] = diff
+    
+    @njit(cache=True, parallel=True, boundscheck=False)
+    def _hash_delta(new: np.ndarray, old: np.ndarray, rows: np.ndarray,
+                    changed: np.ndarray, keys: np.ndarray) -> np.uint64:
+        """Change in the board hash from old to new
+        
+        Only the tiles flagged in changed are visited, and rows must list
+        every row that has one. Each tile is packed into a word the same way
+        as _pack_rows and weighted by its key.
+        """
+        width = new.shape[1] - 2
+        blocks = changed.shape[1] - 2
+        delta = np.uint64(0)
+        for r in prange(rows.shape[0]):
+            y = rows[r]
+            for b in range(blocks):
+                if not changed[y, b + 1]:
+                    continue
+                x0 = b * _BLOCK_WIDTH + 1
+                count = min(_BLOCK_WIDTH, width - b * _BLOCK_WIDTH)
+                word_new = np.uint64(0)
+                word_old = np.uint64(0)
+                for i in range(count):
+                    word_new |= np.uint64(new[y, x0 + i]) << np.uint64(i)
+                    word_old |= np.uint64(old[y, x0 + i]) << np.uint64(i)
+                delta += (word_new - word_old) * keys[y, b + 1]
+        return delta
+else:
+    _step = _step_packed
+    # The NumPy stencil recomputes the whole board anyway, so the hash is too
+    _hash_delta = None
 
 class GameOfLife:
-    def __init__(self, width: int, height: int):
+    def __init__(self, width: int, height: int, seed: Optional[int] = None):
         self.width = width
         self.height = height
-        self.live_cells: Set[Tuple[int, int]] = set()
+        self.rng = np.random.default_rng(seed)
+        # 1-cell dead halo around the board so the stencil needs no bounds checks
+        self.grid = np.zeros((height + 2, width + 2), dtype=np.uint8)
+        # Back buffer for next_generation, swapped with grid after each step
+        self._next_grid = np.zeros_like(self.grid)
+        # Flags per row and block of _BLOCK_WIDTH columns (with a halo) for
+        # the parts that changed in the last step or were edited since. Only
+        # blocks next to a change can change in the next step, so dead and
+        # settled regions are skipped.
+        # Skipped tiles are never written, so this relies on _next_grid
+        # matching grid everywhere that isn't flagged. A step keeps that true
+        # by itself, since the buffers then differ only in the tiles it
+        # flagged. Every edit of grid must flag the (row, block) it touches,
+        # or all of them for a bulk edit (see _edited)
+        blocks = (width + _BLOCK_WIDTH - 1) // _BLOCK_WIDTH
+        self._changed = np.ones((height + 2, blocks + 2), dtype=np.uint8)
+        self._active = np.zeros_like(self._changed)
+        # Cycles are found by comparing a hash of the board against a
+        # snapshot retaken at exponentially spaced generations (Brent's
+        # method). The hash sums each row word times a random key, so a step
+        # only rehashes the tiles it changed. Once the board repeats, one
+        # period of states is recorded and then replayed instead of recomputed
+        self._hash_keys = np.random.default_rng(0).integers(
+            0, 2**64, size=self._changed.shape, dtype=np.uint64)
+        self._cycle: Optional[List[np.ndarray]] = None
+        self._cycle_pos = 0
+        self._forget_history()
         self.generation = 0
         self.paused = True
     
+    @property
+    def live_cells(self) -> Set[Tuple[int, int]]:
+        """Coordinates of all live cells as (x, y) tuples"""
+        ys, xs = np.nonzero(self.grid[1:-1, 1:-1])
+        return set(zip(xs.tolist(), ys.tolist()))
+    
+    @live_cells.setter
+    def live_cells(self, cells):
+        self._edited()
+        self.grid[:] = 0
+        self._set_cells(np.array(list(cells), dtype=np.intp))
+    
+    def _set_cells(self, cells: np.ndarray):
+        """Make the cells in an (n, 2) array of (x, y) coordinates live"""
+        # Off-board coordinates are dropped in one pass rather than per cell
+        xs, ys = cells.reshape(-1, 2).T
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.grid[ys[inside] + 1, xs[inside] + 1] = 1
+    
+    def population(self) -> int:
+        """Number of live cells"""
+        return int(np.count_nonzero(self.grid))
+    
+    def _on_board(self, x: int, y: int) -> bool:
+        """Check whether (x, y) is a board cell rather than in or past the halo
+        
+        Single cell reads and writes go through this. Negative indices would
+        wrap into the far edge, and writes to the halo would break the
+        stencils, which rely on it staying dead instead of checking bounds.
+        """
+        return 0 <= x < self.width and 0 <= y < self.height
+    
+    def is_alive(self, x: int, y: int) -> bool:
+        """Check whether a cell is live, off-board cells never are"""
+        return self._on_board(x, y) and bool(self.grid[y + 1, x + 1])
+    
     def initialize_random(self, density: float = 0.2):
         """Initialize the grid with random live cells"""
-        self.live_cells = set()
-        for y in range(self.height):
-            for x in range(self.width):
-                if random.random() < density:
-                    self.live_cells.add((x, y))
+        self._edited()
+        self.grid[1:-1, 1:-1] = self.rng.random((self.height, self.width)) < density
     
     def clear(self):
         """Clear all live cells"""
-        self.live_cells = set()
+        self._edited()
+        self.grid[:] = 0
         self.generation = 0
     
-    def count_live_neighbors(self, x: int, y: int) -> int:
-        """Count the number of live neighbors for a cell"""
-        count = 0
-        for dy in [-1, 0, 1]:
-            for dx in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue  # Skip the cell itself
-                nx, ny = x + dx, y + dy
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    if (nx, ny) in self.live_cells:
-                        count += 1
-        return count
-    
-    def next_generation(self):
-        """Calculate the next generation of cells"""
-        new_live_cells = set()
+    def _edited(self, x: Optional[int] = None, y: Optional[int] = None):
+        """Invalidate stepping state before the grid is edited
         
-        # Consider all cells that are currently live or adjacent to live cells
-        candidates = set()
-        for (x, y) in self.live_cells:
-            for dy in [-1, 0, 1]:
-                for dx in [-1, 0, 1]:
-                    nx, ny = x + dx, y + dy
-                    if 0 <= nx < self.width and 0 <= ny < self.height:
-                        candidates.add((nx, ny))
+        (x, y) is the edited cell, or None for a bulk edit.
+        """
+        self._forget_history()
+        if self._cycle is not None:
+            # grid is one of the read-only cycle states, take a private copy
+            self.grid = self.grid.copy()
+            self._cycle = None
+            x = y = None
+        if x is None:
+            self._changed[1:-1, 1:-1] = 1
+        else:
+            self._changed[y + 1, x // _BLOCK_WIDTH + 1] = 1
+    
+    def _forget_history(self):
+        """Restart cycle detection from the current grid"""
+        self._hash: Optional[int] = None
+        self._snapshot: Optional[np.ndarray] = None
+        self._snapshot_hash: Optional[int] = None
+        self._power = 1  # Generations until the snapshot is retaken
+        self._steps = 0  # Generations since the snapshot was taken
+        self._recording: Optional[List[np.ndarray]] = None
+        self.period: Optional[int] = None
+    
+    def _full_hash(self) -> int:
+        """Hash of the whole board, see _hash_delta"""
+        words = _pack_rows(self.grid[1:-1, 1:-1])[1:-1, 1:-1]
+        return int((words * self._hash_keys[1:-1, 1:-1]).sum())
+    
+    def _frozen_grid(self) -> np.ndarray:
+        """Read-only copy of the grid, for the states of a replayed cycle"""
+        state = self.grid.copy()
+        state.flags.writeable = False
+        return state
+    
+    def _record_generation(self, rows: np.ndarray):
+        """Look for a repeat of the generation just computed from rows"""
+        if self.period is not None:
+            # Collect one period of states, then switch to replaying them
+            if self._recording is not None:
+                self._recording.append(self._frozen_grid())
+                if len(self._recording) == self.period:
+                    self._cycle, self._recording = self._recording, None
+                    self._cycle_pos = self.period - 1
+                    self.grid = self._cycle[-1]
+            return
         
-        for (x, y) in candidates:
-            live_neighbors = self.count_live_neighbors(x, y)
-            
-            # Apply Conway's rules
-            if (x, y) in self.live_cells and live_neighbors in [2, 3]:
-                new_live_cells.add((x, y))
-            elif (x, y) not in self.live_cells and live_neighbors == 3:
-                new_live_cells.add((x, y))
+        if self._hash is None or _hash_delta is None:
+            self._hash = self._full_hash()
+        else:
+            delta = _hash_delta(self.grid, self._next_grid, rows, 
+                                self._changed, self._hash_keys)
+            self._hash = (self._hash + int(delta)) % 2**64
         
-        self.live_cells = new_live_cells
+        # The full comparison only runs when the hashes already match
+        self._steps += 1
+        if self._hash == self._snapshot_hash and np.array_equal(self.grid, self._snapshot):
+            self.period = self._steps
+            self._snapshot = None
+            if self.period <= _CYCLE_BOARDS:
+                self._recording = [self._frozen_grid()]
+        elif self._steps == self._power:
+            self._snapshot = self.grid.copy()
+            self._snapshot_hash = self._hash
+            self._power *= 2
+            self._steps = 0
+    
+    def next_generation(self):
+        """Calculate the next generation of cells"""
         self.generation += 1
+        if self._cycle is not None:
+            self._cycle_pos = (self._cycle_pos + 1) % self.period
+            self.grid = self._cycle[self._cycle_pos]
+            return
+        
+        # Dilate the changed map by one in each direction, rows then columns,
+        # and list the rows that have tiles to recompute
+        changed, active = self._changed, self._active
+        near = changed[:-2] | changed[1:-1] | changed[2:]
+        active[1:-1, 1:-1] = near[:, :-2] | near[:, 1:-1] | near[:, 2:]
+        rows = np.flatnonzero(active.any(axis=1))
+        changed[:] = 0
+        _step(self.grid, self._next_grid, rows, active, changed)
+        self.grid, self._next_grid = self._next_grid, self.grid
+        # Still lifes are already cheap to step, only look for longer cycles
+        if changed.any():
+            self._record_generation(rows)
     
     def toggle_cell(self, x: int, y: int):
-        """Toggle a cell between live and dead"""
-        if (x, y) in self.live_cells:
-            self.live_cells.remove((x, y))
-        else:
-            self.live_cells.add((x, y))
+        """Toggle a cell between live and dead, off-board cells are ignored"""
+        if not self._on_board(x, y):
+            return
+        self._edited(x, y)
+        self.grid[y + 1, x + 1] ^= 1
     
     def save_pattern(self, filename: str):
         """Save the current pattern to a file"""
+        # Cells are written in storage order; load_pattern doesn't need them sorted
+        ys, xs = np.nonzero(self.grid[1:-1, 1:-1])
         with open(filename, 'w') as f:
-            for (x, y) in sorted(self.live_cells):
-                f.write(f"{x},{y}\n")
+            f.writelines(f"{x},{y}\n" for x, y in zip(xs.tolist(), ys.tolist()))
     
     def load_pattern(self, filename: str):
         """Load a pattern from a file"""
         self.clear()
         try:
-            with open(filename, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        x, y = map(int, line.split(','))
-                        if 0 <= x < self.width and 0 <= y < self.height:
-                            self.live_cells.add((x, y))
+            with open(filename, 'r') as f, warnings.catch_warnings():
+                # An empty file is just an empty pattern
+                warnings.simplefilter('ignore', UserWarning)
+                # Blank and whitespace-only lines are skipped, and nothing is
+                # treated as a comment, as with the old line-by-line reader
+                cells = np.loadtxt((line for line in f if line.strip()), delimiter=',', 
+                                   comments=None, dtype=np.intp, ndmin=2)
         except FileNotFoundError:
             print(f"File {filename} not found. Starting with empty grid.")
+            return
+        self._set_cells(cells)
+
+# Same full-adder stencil as _step_packed, one thread per 64-cell word.
+# Grids are (height + 2) x (words + 2) words with a zero border
+_CUDA_STEP_SOURCE = r'''
+__device__ void full_add(unsigned long long a, unsigned long long b,
+                         unsigned long long c, unsigned long long* sum,
+                         unsigned long long* carry)
+{
+    unsigned long long t = a ^ b;
+    *sum = t ^ c;
+    *carry = (a & b) | (t & c);
+}
+
+extern "C" __global__
+void life_step(const unsigned long long* bits, unsigned long long* out,
+               int height, int words, unsigned long long last_mask)
+{
+    int k = blockIdx.x * blockDim.x + threadIdx.x + 1;
+    int y = blockIdx.y * blockDim.y + threadIdx.y + 1;
+    if (k > words || y > height) return;
+    int stride = words + 2;
+
+    unsigned long long west[3], cur[3], east[3];
+    for (int i = 0; i < 3; i++) {
+        const unsigned long long* row = bits + (y - 1 + i) * stride;
+        cur[i] = row[k];
+        west[i] = (row[k] << 1) | (row[k - 1] >> 63);
+        east[i] = (row[k] >> 1) | (row[k + 1] << 63);
+    }
+
+    unsigned long long above0, above1, below0, below1;
+    full_add(west[0], cur[0], east[0], &above0, &above1);
+    full_add(west[2], cur[2], east[2], &below0, &below1);
+    unsigned long long mid0 = west[1] ^ east[1];
+    unsigned long long mid1 = west[1] & east[1];
+
+    unsigned long long ones, carry, twos_partial, fours_a;
+    full_add(above0, below0, mid0, &ones, &carry);
+    full_add(above1, below1, mid1, &twos_partial, &fours_a);
+    unsigned long long twos = twos_partial ^ carry;
+    unsigned long long fours_b = twos_partial & carry;
+
+    unsigned long long alive = twos & ~(fours_a | fours_b) & (ones | cur[1]);
+    if (k == words) alive &= last_mask;  // keep cells past the right edge dead
+    out[y * stride + k] = alive;
+}
+'''
+
+class CudaGameOfLife(GameOfLife):
+    """GameOfLife that keeps the board bit-packed on the GPU
+    
+    The host grid is only refreshed when it is read, so running several
+    generations between frames costs one device-to-host copy.
+    """
+    _BLOCK = (16, 16)
+    
+    def __init__(self, width: int, height: int, seed: Optional[int] = None):
+        if cupy is None:
+            raise RuntimeError("CuPy is required for --device cuda")
+        self._host_stale = False
+        self._device_stale = True
+        super().__init__(width, height, seed)
+        self._words = (width + 63) // 64
+        tail = width % 64
+        self._last_mask = np.uint64((1 << tail) - 1 if tail else (1 << 64) - 1)
+        self._bits = cupy.zeros((height + 2, self._words + 2), dtype=cupy.uint64)
+        self._next_bits = cupy.zeros_like(self._bits)
+        self._kernel = cupy.RawKernel(_CUDA_STEP_SOURCE, 'life_step')
+    
+    @property
+    def grid(self) -> np.ndarray:
+        self._sync_host()
+        return self._grid
+    
+    @grid.setter
+    def grid(self, value: np.ndarray):
+        self._grid = value
+        self._device_stale = True
+    
+    def _sync_host(self):
+        """Copy the board back from the GPU if it has stepped since"""
+        if self._host_stale:
+            packed = cupy.asnumpy(self._bits).astype(_WORD, copy=False)
+            self._grid[1:-1, 1:-1] = np.unpackbits(
+                packed[1:-1, 1:-1].view(np.uint8), axis=1,
+                count=self.width, bitorder='little')
+            self._host_stale = False
+    
+    def _edited(self, x: Optional[int] = None, y: Optional[int] = None):
+        self._sync_host()
+        self._device_stale = True
+        super()._edited(x, y)
+    
+    def next_generation(self):
+        """Calculate the next generation of cells on the GPU"""
+        if self._device_stale:
+            packed = _pack_rows(self.grid[1:-1, 1:-1])
+            self._bits.set(packed.astype(np.uint64, copy=False))
+            self._device_stale = False
+        bx, by = self._BLOCK
+        blocks = ((self._words + bx - 1) // bx, (self.height + by - 1) // by)
+        self._kernel(blocks, self._BLOCK,
+                     (self._bits, self._next_bits, np.int32(self.height),
+                      np.int32(self._words), self._last_mask))
+        self._bits, self._next_bits = self._next_bits, self._bits
+        self._host_stale = True
+        self.generation += 1
 
 def main():
     args = parse_args()
@@ -107,19 +503,83 @@ def main():
     cell_size = args.cell_size
     screen_width = args.width * cell_size + 200  # Extra space for UI
     screen_height = args.height * cell_size
-    screen = pygame.display.set_mode((screen_width, screen_height))
+    screen = pygame.display.set_mode((screen_width, screen_height), 
+                                     pygame.DOUBLEBUF | pygame.HWSURFACE)
     pygame.display.set_caption("Conway's Game of Life")
     
     clock = pygame.time.Clock()
     font = pygame.font.SysFont('Arial', 16)
     
     # Initialize the game
-    game = GameOfLife(args.width, args.height)
+    game_class = CudaGameOfLife if args.device == 'cuda' else GameOfLife
+    game = game_class(args.width, args.height, args.seed)
+    
+    # Everything that never changes (grid lines, UI panel, control help) is
+    # drawn once. The same surface is used to repaint the screen behind
+    # cells that died and status lines that are about to be re-rendered
+    background = pygame.Surface(screen.get_size()).convert()
+    background.fill((240, 240, 240))  # Light gray background
+    for x in range(args.width + 1):
+        pygame.draw.line(background, (200, 200, 200), 
+                        (x * cell_size, 0), 
+                        (x * cell_size, args.height * cell_size))
+    for y in range(args.height + 1):
+        pygame.draw.line(background, (200, 200, 200), 
+                        (0, y * cell_size), 
+                        (args.width * cell_size, y * cell_size))
+    
+    panel_x = args.width * cell_size + 10
+    pygame.draw.rect(background, (220, 220, 220), 
+                    (panel_x, 0, screen_width - panel_x, screen_height))
+    
+    # Status lines come first in the panel, followed by the static help
+    status_lines = 5
+    help_texts = [
+        "",
+        "Controls:",
+        "Space: Play/Pause",
+        "N: Next generation",
+        "C: Clear",
+        "R: Random fill",
+        "S: Save pattern",
+        "L: Load pattern",
+        "",
+        "Click/drag: Toggle cells"
+    ]
+    for i, text in enumerate(help_texts, status_lines):
+        text_surface = font.render(text, True, (0, 0, 0))
+        background.blit(text_surface, (panel_x + 10, 10 + i * 20))
+    
+    # Live cells are blitted from a single pre-filled surface
+    cell_surface = pygame.Surface((cell_size - 1, cell_size - 1)).convert()
+    cell_surface.fill((50, 150, 50))
+    
+    # When cells are only a few pixels wide there are too many to blit one
+    # by one. Instead the board is written to a surface with one pixel per
+    # cell, scaled up once, and the grid lines are laid back over it
+    pixel_render = cell_size <= 4
+    if pixel_render:
+        playfield_rect = pygame.Rect(0, 0, args.width * cell_size, screen_height)
+        playfield = screen.subsurface(playfield_rect)
+        # 8-bit surfaces whose pixel values are the cell states
+        board_cells = pygame.Surface((args.width, args.height), depth=8)
+        board_cells.set_palette_at(0, (240, 240, 240))
+        board_cells.set_palette_at(1, (50, 150, 50))
+        board_scaled = pygame.Surface(playfield_rect.size, depth=8)
+        board_scaled.set_palette(board_cells.get_palette())
+        # Grid lines from the background, with the rest transparent
+        grid_lines = background.subsurface(playfield_rect).copy()
+        grid_lines.set_colorkey((240, 240, 240), pygame.RLEACCEL)
     
     # Main game loop
     running = True
     dragging = False
     drawing_live = True
+    redraw_all = True
+    sim_time = 0.0  # Time owed to the simulation, in seconds
+    sim_step = 1 / args.sim_hz
+    shown = np.zeros((args.height, args.width), dtype=np.uint8)  # Board as last drawn
+    prev_texts = []
     
     while running:
         # Handle events
@@ -127,6 +587,9 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
             
+            elif event.type == pygame.VIDEOEXPOSE:
+                redraw_all = True
+            
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
                     game.paused = not game.paused
@@ -146,7 +609,7 @@ def main():
                     x, y = event.pos[0] // cell_size, event.pos[1] // cell_size
                     if x < args.width:  # Only if clicking in the grid area
                         dragging = True
-                        drawing_live = (x, y) not in game.live_cells
+                        drawing_live = not game.is_alive(x, y)
                         game.toggle_cell(x, y)
             
             elif event.type == pygame.MOUSEBUTTONUP:
@@ -156,62 +619,89 @@ def main():
             elif event.type == pygame.MOUSEMOTION and dragging:
                 x, y = event.pos[0] // cell_size, event.pos[1] // cell_size
                 if x < args.width:  # Only if dragging in the grid area
-                    if ((x, y) in game.live_cells) != drawing_live:
+                    if game.is_alive(x, y) != drawing_live:
                         game.toggle_cell(x, y)
         
-        # Update game state if not paused
-        if not game.paused:
-            game.next_generation()
-        
-        # Draw everything
-        screen.fill((240, 240, 240))  # Light gray background
-        
-        # Draw grid lines
-        for x in range(args.width + 1):
-            pygame.draw.line(screen, (200, 200, 200), 
-                            (x * cell_size, 0), 
-                            (x * cell_size, args.height * cell_size))
-        for y in range(args.height + 1):
-            pygame.draw.line(screen, (200, 200, 200), 
-                            (0, y * cell_size), 
-                            (args.width * cell_size, y * cell_size))
-        
-        # Draw live cells
-        for (x, y) in game.live_cells:
-            pygame.draw.rect(screen, (50, 150, 50), 
-                            (x * cell_size + 1, y * cell_size + 1, 
-                             cell_size - 1, cell_size - 1))
-        
-        # Draw UI panel
-        panel_x = args.width * cell_size + 10
-        pygame.draw.rect(screen, (220, 220, 220), 
-                        (panel_x, 0, screen_width - panel_x, screen_height))
+        # Run every generation that has come due since the last frame,
+        # independently of how often frames are drawn
+        dt = clock.tick(args.render_hz) / 1000
+        if game.paused:
+            sim_time = 0.0
+        else:
+            # Don't try to catch up on more than a quarter second of lag
+            sim_time = min(sim_time + dt, max(0.25, sim_step))
+            # Nor spend more than a frame's worth of wall time stepping, so
+            # events are still handled when generations can't keep up with
+            # sim_hz. Whatever is left unpaid then is dropped
+            deadline = time.perf_counter() + 1 / args.render_hz
+            while sim_time >= sim_step:
+                game.next_generation()
+                sim_time -= sim_step
+                if time.perf_counter() >= deadline:
+                    sim_time = 0.0
+                    break
         
-        # Draw UI text
         status = "Paused" if game.paused else "Running"
         texts = [
             f"Generation: {game.generation}",
             f"Status: {status}",
-            f"Live cells: {len(game.live_cells)}",
-            f"FPS: {args.fps}",
-            "",
-            "Controls:",
-            "Space: Play/Pause",
-            "N: Next generation",
-            "C: Clear",
-            "R: Random fill",
-            "S: Save pattern",
-            "L: Load pattern",
-            "",
-            "Click/drag: Toggle cells"
+            f"Live cells: {game.population()}",
+            f"Speed: {args.sim_hz:g} gen/s",
+            f"FPS: {args.render_hz}"
         ]
         
+        # Draw only what changed since the last frame
+        dirty_rects = []
+        if redraw_all:
+            screen.blit(background, (0, 0))
+            dirty_rects.append(screen.get_rect())
+            shown[:] = 0
+            prev_texts = [None] * len(texts)
+            redraw_all = False
+        
+        if pixel_render:
+            # Nothing to redraw while the board is paused or settled
+            cells = game.grid[1:-1, 1:-1]
+            if not np.array_equal(cells, shown):
+                np.copyto(shown, cells)
+                pygame.surfarray.blit_array(board_cells, cells.T)
+                pygame.transform.scale(board_cells, playfield_rect.size, board_scaled)
+                playfield.blit(board_scaled, (0, 0))
+                playfield.blit(grid_lines, (0, 0))
+                dirty_rects.append(playfield_rect)
+        else:
+            # Find and classify the cells that flipped since the last frame
+            # in one pass over the board, with no per-cell set lookups
+            cells = game.grid[1:-1, 1:-1]
+            ys, xs = np.nonzero(cells != shown)
+            born = cells[ys, xs].astype(bool)
+            np.copyto(shown, cells)
+            
+            # Erase cells that died by repainting the background behind them,
+            # then draw cells that were born. Each is a single batched blits call
+            dead_rects = [pygame.Rect(x * cell_size + 1, y * cell_size + 1, 
+                                      cell_size - 1, cell_size - 1)
+                          for x, y in zip(xs[~born].tolist(), ys[~born].tolist())]
+            screen.blits([(background, rect, rect) for rect in dead_rects], False)
+            born_rects = [pygame.Rect(x * cell_size + 1, y * cell_size + 1, 
+                                      cell_size - 1, cell_size - 1)
+                          for x, y in zip(xs[born].tolist(), ys[born].tolist())]
+            screen.blits([(cell_surface, rect) for rect in born_rects], False)
+            dirty_rects += dead_rects
+            dirty_rects += born_rects
+        
+        # Re-render only the status lines whose text changed
         for i, text in enumerate(texts):
-            text_surface = font.render(text, True, (0, 0, 0))
-            screen.blit(text_surface, (panel_x + 10, 10 + i * 20))
+            if text != prev_texts[i]:
+                rect = pygame.Rect(panel_x + 10, 10 + i * 20, 
+                                   screen_width - panel_x - 10, 20)
+                screen.blit(background, rect, rect)
+                text_surface = font.render(text, True, (0, 0, 0))
+                screen.blit(text_surface, rect)
+                dirty_rects.append(rect)
+        prev_texts = texts
         
-        pygame.display.flip()
-        clock.tick(args.fps)
+        pygame.display.update(dirty_rects)
     
     pygame.quit()
     sys.exit()
@@ -17,6 +17,22 @@ class TestBlinker(unittest.TestCase):
         game.next_generation()
         expected = {(1, 2), (2, 2), (3, 2)}
         self.assertEqual(game.live_cells, expected)
+    
+    def test_blinker_period(self):
+        game = GameOfLife(5, 5)
+        game.live_cells = {(1, 2), (2, 2), (3, 2)}
+        
+        # The blinker repeats every second generation
+        for _ in range(4):
+            game.next_generation()
+        self.assertEqual(game.period, 2)
+        
+        # Replayed generations still alternate, and edits stop the replay
+        game.next_generation()
+        self.assertEqual(game.live_cells, {(2, 1), (2, 2), (2, 3)})
+        game.toggle_cell(0, 0)
+        self.assertIsNone(game.period)
+        self.assertEqual(game.live_cells, {(0, 0), (2, 1), (2, 2), (2, 3)})
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
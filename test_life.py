@@ -0,0 +1,153 @@
+# tests/test_life.py
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+import numpy as np
+import life
+from life import GameOfLife
+
+def reference_step(cells: np.ndarray) -> np.ndarray:
+    """One generation of a 0/1 board, counting neighbours the plain way"""
+    height, width = cells.shape
+    padded = np.pad(cells.astype(int), 1)
+    neighbours = sum(padded[1 + dy:1 + dy + height, 1 + dx:1 + dx + width]
+                     for dy in (-1, 0, 1) for dx in (-1, 0, 1) if dy or dx)
+    return ((neighbours == 3) | ((cells == 1) & (neighbours == 2))).astype(np.uint8)
+
+class TestBounds(unittest.TestCase):
+    def test_is_alive_off_board(self):
+        game = GameOfLife(4, 3)
+        # Fill the board so a wrapped or halo read would report a live cell
+        game.live_cells = {(x, y) for x in range(4) for y in range(3)}
+        
+        # Dragging outside the window reports positions past every edge
+        for x, y in [(-1, 0), (0, -1), (-3, -3), (4, 0), (0, 3), (0, 36), (99, 99)]:
+            self.assertFalse(game.is_alive(x, y))
+        self.assertTrue(game.is_alive(3, 2))
+    
+    def test_toggle_off_board(self):
+        game = GameOfLife(4, 3)
+        game.live_cells = {(0, 0), (3, 2)}
+        before = game.grid.copy()
+        
+        # Toggles in the halo (or wrapping into the board) are ignored
+        for x, y in [(-1, 0), (4, 0), (0, 3), (0, -1), (-1, -1), (4, 3)]:
+            game.toggle_cell(x, y)
+        self.assertTrue((game.grid == before).all())
+        
+        # The halo is still dead, so the board steps as if nothing happened
+        game.next_generation()
+        self.assertEqual(game.live_cells, set())
+
+class TestSteppers(unittest.TestCase):
+    def check_stepper(self, step):
+        rng = np.random.default_rng(1)
+        # Widths around the 64-cell word cover the tail mask and the carries
+        # between neighbouring words
+        for width in (1, 63, 64, 65, 130):
+            for height in (1, 6):
+                with self.subTest(width=width, height=height):
+                    blocks = (width + 63) // 64
+                    rows = np.arange(1, height + 1)
+                    active = np.ones((height + 2, blocks + 2), dtype=np.uint8)
+                    g = np.zeros((height + 2, width + 2), dtype=np.uint8)
+                    g[1:-1, 1:-1] = rng.random((height, width)) < 0.4
+                    
+                    for _ in range(10):
+                        out = np.zeros_like(g)
+                        changed = np.zeros_like(active)
+                        step(g, out, rows, active, changed)
+                        expected = reference_step(g[1:-1, 1:-1])
+                        np.testing.assert_array_equal(out[1:-1, 1:-1], expected)
+                        self.assertFalse(out[0].any() or out[-1].any() or 
+                                         out[:, 0].any() or out[:, -1].any())
+                        
+                        # A block is flagged exactly when one of its cells flipped
+                        flipped = np.zeros((height, blocks * 64), dtype=bool)
+                        flipped[:, :width] = out[1:-1, 1:-1] != g[1:-1, 1:-1]
+                        np.testing.assert_array_equal(
+                            changed[1:-1, 1:-1].astype(bool), 
+                            flipped.reshape(height, blocks, 64).any(axis=2))
+                        g = out
+    
+    def test_packed_stepper(self):
+        self.check_stepper(life._step_packed)
+    
+    @unittest.skipIf(life.njit is None, "Numba is not installed")
+    def test_numba_stepper(self):
+        self.check_stepper(life._step)
+
+class TestSkipping(unittest.TestCase):
+    def test_edits_across_block_boundaries(self):
+        width, height = 150, 24
+        rng = np.random.default_rng(2)
+        game = GameOfLife(width, height)
+        reference = np.zeros((height, width), dtype=np.uint8)
+        # A glider heading right plus a few oscillators keep most blocks
+        # settled while activity reaches the boundaries at columns 64 and 128
+        cells = {(1, 0), (2, 1), (0, 2), (1, 2), (2, 2),
+                 (62, 10), (63, 10), (64, 10), (126, 18), (127, 18), (128, 18)}
+        game.live_cells = cells
+        for x, y in cells:
+            reference[y, x] = 1
+        
+        for generation in range(120):
+            # Toggle cells on both sides of a block boundary while it runs
+            if generation % 3 == 0:
+                for x in (63, 64, 127, 128):
+                    y = int(rng.integers(height))
+                    game.toggle_cell(x, y)
+                    reference[y, x] ^= 1
+            game.next_generation()
+            reference = reference_step(reference)
+            ys, xs = np.nonzero(reference)
+            self.assertEqual(game.live_cells, set(zip(xs.tolist(), ys.tolist())), 
+                             f"generation {generation}")
+
+class TestPatterns(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'patterns.txt')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def load(self, text: str, width: int = 10, height: int = 8) -> GameOfLife:
+        with open(self.path, 'w') as f:
+            f.write(text)
+        game = GameOfLife(width, height)
+        game.live_cells = {(5, 5)}  # Loading replaces whatever was there
+        game.load_pattern(self.path)
+        return game
+    
+    def test_round_trip(self):
+        cells = {(0, 0), (9, 0), (3, 4), (4, 4), (0, 7), (9, 7)}
+        game = GameOfLife(10, 8)
+        game.live_cells = cells
+        game.save_pattern(self.path)
+        
+        loaded = GameOfLife(10, 8)
+        loaded.load_pattern(self.path)
+        self.assertEqual(loaded.live_cells, cells)
+    
+    def test_off_board_and_blank_lines(self):
+        game = self.load("1,2\n\n-1,3\n   \n10,0\n0,8\n\t\n3,1\n")
+        self.assertEqual(game.live_cells, {(1, 2), (3, 1)})
+    
+    def test_empty_file(self):
+        game = self.load("")
+        self.assertEqual(game.live_cells, set())
+    
+    def test_missing_file(self):
+        game = GameOfLife(10, 8)
+        game.live_cells = {(5, 5)}
+        out = io.StringIO()
+        with redirect_stdout(out):
+            game.load_pattern(os.path.join(self.tmp.name, 'missing.txt'))
+        self.assertEqual(game.live_cells, set())
+        self.assertIn("not found", out.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
\ No newline at end of file